@@ -0,0 +1,99 @@
+import pytest
+
+from translatesubs.managers import watch_manager
+from translatesubs.managers.watch_manager import JobStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(watch_manager, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def filename(tmp_path):
+    return str(tmp_path / 'jobs.db')
+
+
+@pytest.fixture
+def store(filename, clock):
+    return JobStore(filename)
+
+
+def status(store, path):
+    return store.connection.execute('SELECT status FROM jobs WHERE path = ?', (path,)).fetchone()[0]
+
+
+def test_enqueues_file_once_until_it_changes(store):
+    assert store.enqueue('ep1.ass', 1.0)
+    assert not store.enqueue('ep1.ass', 1.0)
+    assert store.claim(5) == ['ep1.ass']
+    store.complete('ep1.ass')
+
+    assert store.enqueue('ep1.ass', 2.0)
+    assert store.claim(5) == ['ep1.ass']
+
+
+def test_claims_at_most_limit_jobs(store):
+    for index in range(3):
+        store.enqueue(f'ep{index}.ass', 1.0)
+
+    assert len(store.claim(2)) == 2
+    assert len(store.claim(2)) == 1
+    assert store.claim(2) == []
+
+
+def test_file_changed_while_running_is_queued_again_once_finished(store):
+    store.enqueue('ep1.ass', 1.0)
+    store.claim(5)
+    assert store.enqueue('ep1.ass', 2.0)
+    assert store.claim(5) == []
+
+    store.complete('ep1.ass')
+    assert store.claim(5) == ['ep1.ass']
+    store.complete('ep1.ass')
+    assert status(store, 'ep1.ass') == JobStore.DONE
+
+
+def test_failed_job_is_retried_with_backoff_and_given_up_on(store, clock):
+    store.enqueue('ep1.ass', 1.0)
+    for delay in (10, 20):
+        store.claim(5)
+        assert store.fail('ep1.ass', 'blocked', retries=2, retry_delay=10)
+        clock.now += delay - 1
+        assert store.claim(5) == []
+        clock.now += 1
+
+    store.claim(5)
+    assert not store.fail('ep1.ass', 'blocked', retries=2, retry_delay=10)
+    assert status(store, 'ep1.ass') == JobStore.FAILED
+    assert not store.has_unfinished()
+
+
+def test_running_jobs_are_queued_again_on_restart(filename, store):
+    store.enqueue('ep1.ass', 1.0)
+    store.claim(5)
+    store.enqueue('ep1.ass', 2.0)
+    store.connection.close()
+
+    store = JobStore(filename)
+    assert store.claim(5) == ['ep1.ass']
+    store.complete('ep1.ass')
+    assert status(store, 'ep1.ass') == JobStore.DONE
+
+
+def test_outputs_are_recognised(store):
+    store.enqueue('ep1.ass', 1.0)
+    store.claim(5)
+    store.add_outputs('ep1.ass', ['out/ep1.es.ass', 'out/ep1.merged.ass'])
+    assert store.is_output('out/ep1.merged.ass')
+    assert not store.is_output('ep1.ass')
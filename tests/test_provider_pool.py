@@ -0,0 +1,102 @@
+import pytest
+
+from translatesubs.translators import provider_pool
+from translatesubs.translators.itranslator import TranslationError
+from translatesubs.translators.provider_pool import ProviderPool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.now += seconds
+
+
+class NoJitter:
+    @staticmethod
+    def uniform(low, high):
+        return low
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(provider_pool, 'time', clock)
+    monkeypatch.setattr(provider_pool, 'random', NoJitter)
+    return clock
+
+
+def responding(clock, latencies, blocked=()):
+    """Request, which takes the given time for every provider and fails for the blocked ones."""
+    def request(provider):
+        if provider in blocked:
+            raise AttributeError
+        clock.now += latencies[provider]
+        return provider
+    return request
+
+
+def test_untried_providers_are_used_in_given_order(clock):
+    pool = ProviderPool(['com', 'co.uk', 'lt'])
+    assert pool.call(responding(clock, {'com': 1, 'co.uk': 1, 'lt': 1}, blocked={'com'})) == 'co.uk'
+
+
+def test_cooldown_doubles_every_time_provider_gets_blocked(clock):
+    pool = ProviderPool(['com'], cooldown=60, max_cooldown=100, max_wait=1000)
+    calls = []
+    sleeps = []
+    sleep = clock.sleep
+
+    def request(provider):
+        calls.append(provider)
+        if len(calls) <= 3:
+            raise AttributeError
+        return provider
+
+    def record_sleep(seconds):
+        sleeps.append(seconds)
+        sleep(seconds)
+
+    clock.sleep = record_sleep
+    assert pool.call(request) == 'com'
+    assert sleeps == [60, 100, 100]
+
+
+def test_fastest_healthy_provider_is_used(clock):
+    pool = ProviderPool(['com', 'co.uk', 'lt'])
+    pool.call(responding(clock, {'com': 5, 'co.uk': 1, 'lt': 1}))
+    pool.call(responding(clock, {'com': 5, 'co.uk': 1, 'lt': 1}, blocked={'com'}))
+    assert pool.call(responding(clock, {'com': 5, 'co.uk': 1, 'lt': 1})) == 'co.uk'
+
+    pool.call(responding(clock, {'com': 5, 'co.uk': 1, 'lt': 1}, blocked={'co.uk'}))
+    assert pool.call(responding(clock, {'com': 5, 'co.uk': 1, 'lt': 1})) == 'lt'
+
+
+def test_waits_for_blocked_provider_to_come_back(clock):
+    pool = ProviderPool(['com'], cooldown=60)
+    calls = []
+
+    def request(provider):
+        calls.append(provider)
+        if len(calls) == 1:
+            raise AttributeError
+        return provider
+
+    assert pool.call(request) == 'com'
+    assert clock.slept == 60
+
+
+def test_raises_translation_error_after_max_wait(clock):
+    pool = ProviderPool(['com', 'lt'], cooldown=60, max_wait=200)
+    with pytest.raises(TranslationError):
+        pool.call(responding(clock, {}, blocked={'com', 'lt'}))
+    assert clock.slept <= 200
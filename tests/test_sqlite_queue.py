@@ -0,0 +1,91 @@
+import pytest
+
+from translatesubs.queues import sqlite_queue
+from translatesubs.queues.sqlite_queue import SqliteQueue
+from translatesubs.translators.translated import Translated
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(sqlite_queue, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    return SqliteQueue(str(tmp_path / 'chunks.db'), claim_timeout=60, max_attempts=3)
+
+
+def translated(text):
+    return Translated(original=text, translated=text.upper(), pronounce_original=text, pronounce_translated=text)
+
+
+def test_results_are_keyed_by_position_whatever_order_they_finish_in(queue):
+    queue.publish('batch', 'googletrans', 'es', ['a', 'b', 'c'])
+    claimed = [queue.claim(['googletrans']) for _ in range(3)]
+    for chunk_id, token, _, _, text in reversed(claimed):
+        queue.complete(chunk_id, token, translated(text))
+
+    results = queue.results('batch')
+    assert [results[position].translated for position in range(3)] == ['A', 'B', 'C']
+
+
+def test_claims_only_chunks_for_given_translators(queue):
+    queue.publish('batch', 'google_trans_new', 'es', ['a'])
+    assert queue.claim(['googletrans']) is None
+    assert queue.claim(['google_trans_new'])[2:] == ('google_trans_new', 'es', 'a')
+
+
+def test_expired_claim_cannot_touch_chunk_claimed_again(queue, clock):
+    queue.publish('batch', 'googletrans', 'es', ['a'])
+    chunk_id, first_token, *_ = queue.claim(['googletrans'])
+    clock.now += 61
+    _, second_token, *_ = queue.claim(['googletrans'])
+
+    queue.fail(chunk_id, first_token, 'late')
+    queue.release(chunk_id, first_token)
+    queue.complete(chunk_id, first_token, translated('late'))
+    assert queue.claim(['googletrans']) is None
+    assert queue.results('batch') == {}
+
+    queue.complete(chunk_id, second_token, translated('a'))
+    assert queue.results('batch')[0].translated == 'A'
+
+
+def test_gives_up_after_max_attempts(queue):
+    queue.publish('batch', 'googletrans', 'es', ['a'])
+    for _ in range(3):
+        chunk_id, token, *_ = queue.claim(['googletrans'])
+        queue.fail(chunk_id, token, 'unsupported')
+
+    assert queue.claim(['googletrans']) is None
+    assert queue.errors('batch') == ['chunk 0: unsupported']
+
+
+def test_expired_claims_count_as_attempts(queue, clock):
+    queue.publish('batch', 'googletrans', 'es', ['a'])
+    for _ in range(3):
+        assert queue.claim(['googletrans'])
+        clock.now += 61
+
+    assert queue.claim(['googletrans']) is None
+    assert queue.errors('batch') == ['chunk 0: Worker did not report back within 60s.']
+
+
+def test_release_does_not_count_as_attempt(queue):
+    queue.publish('batch', 'googletrans', 'es', ['a'])
+    for _ in range(5):
+        chunk_id, token, *_ = queue.claim(['googletrans'])
+        queue.release(chunk_id, token)
+
+    assert queue.claim(['googletrans'])
+    assert queue.errors('batch') == []
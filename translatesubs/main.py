@@ -2,8 +2,12 @@
 
 from translatesubs.managers.language_manager import LanguageManager
 from translatesubs.managers.subs_manager import SubsManager
+from translatesubs.managers.watch_manager import JobStore, WatchManager
+from translatesubs.managers.worker_manager import WorkerManager
+from translatesubs.translators.itranslator import TranslationError
+from translatesubs.translators.queue_translator import QueueTranslator
 from translatesubs.utils.constants import AVAILABLE_TRANSLATORS, TRANSLATORS_PRINT, DEFAULT_SEPS_PRINT, USE_DEFAULT_SEPS, \
-    DEFAULT_SEPS, SEP_MAX_LENGTH, SUB_FORMATS
+    DEFAULT_SEPS, SEP_MAX_LENGTH, SUB_FORMATS, VIDEO_FORMATS, JOB_STORE_NAME, AVAILABLE_QUEUES, QUEUES_PRINT
 
 import argparse
 import logging
@@ -19,6 +23,11 @@ Future Development:
 
 
 def main():
+    if sys.argv[1:2] == ['watch']:
+        return watch(sys.argv[2:])
+    if sys.argv[1:2] == ['worker']:
+        return worker(sys.argv[2:])
+
     parser = argparse.ArgumentParser(
         description='It is a tool to translate movie subtitles from one language into another, or even show multiple '
                     'language subtitles together.',
@@ -27,6 +36,142 @@ def main():
                         help='Input file to translate; By default it is a subtitle file but if flag --video_file is'
                              ' set, then this is video file name.')
     parser.add_argument('output', type=str, help='Generated translated subtitle file.')
+    parser.add_argument('--plan', action='store_true',
+                        help='Do not translate anything, only prepare the subs and show how many chunks, characters '
+                             'and requests the translation would take.')
+    add_translation_arguments(parser)
+    args = parser.parse_args()
+
+    setup_logging(args.logging)
+    if args.plan:
+        return plan_translation(args, get_translator(args.translator))
+
+    try:
+        translate_subs(args, get_translator(args.translator, args.queue, args.queue_backend, args.queue_timeout))
+    except TranslationError as e:
+        exit(str(e))
+    print('Finished!')
+
+
+def watch(argv):
+    parser = argparse.ArgumentParser(
+        description='Watch a folder and translate every subtitle or video file, which gets dropped into it. New files '
+                    'are queued in a local job store, thus nothing is lost if the watcher gets restarted.',
+        usage='translatesubs watch incoming/ --to_lang fr --merge')
+    parser.add_argument('directory', type=str, help='Folder to watch for new subtitle or video files.')
+    parser.add_argument('--output_dir', default=None, type=str,
+                        help='Folder to store translated subs in. Defaults to "translated" folder inside the watched '
+                             'one.')
+    parser.add_argument('--output_template', default='{name}.{to_lang}.ass', type=str,
+                        help='Translated subs file name, where {name} is replaced with input file name without the '
+                             'extension, {ext} with input file extension and {to_lang} with --to_lang value.')
+    parser.add_argument('--extensions', default=','.join(SUB_FORMATS + VIDEO_FORMATS), type=str,
+                        help='Comma separated list of file extensions to pick up from the watched folder.')
+    parser.add_argument('--job_store', default=None, type=str,
+                        help=f'SQLite file to keep the job queue in. Defaults to "{JOB_STORE_NAME}" inside the watched '
+                             'folder.')
+    parser.add_argument('--workers', default=2, type=int, help='Number of files to translate at the same time.')
+    parser.add_argument('--poll_interval', default=5, type=float,
+                        help='Seconds to wait between checking the folder for new files. A file is only picked up once '
+                             'it did not change between two checks, thus it is not read while still being copied.')
+    parser.add_argument('--retries', default=5, type=int, help='Number of times to retry a failed file.')
+    parser.add_argument('--retry_delay', default=60, type=float,
+                        help='Seconds to wait before retrying a failed file, which doubles after every failed try.')
+    parser.add_argument('--once', action='store_true',
+                        help='Translate the files, which are already in the folder, and exit instead of watching.')
+    add_translation_arguments(parser)
+    args = parser.parse_args(argv)
+
+    setup_logging(args.logging)
+    directory = os.path.abspath(args.directory)
+    output_dir = os.path.abspath(args.output_dir or os.path.join(directory, 'translated'))
+    os.makedirs(output_dir, exist_ok=True)
+
+    # All of the workers share the same translator rather than creating a new one for every file
+    translator = get_translator(args.translator, args.queue, args.queue_backend, args.queue_timeout)
+
+    # The main output is followed by the outputs of every --variant, all of them named using templates
+    templates = [args.output_template] + [template for template, *_ in args.variant or []]
+
+    def output_for(path, template):
+        name, ext = os.path.splitext(os.path.basename(path))
+        return os.path.join(output_dir, template.format(name=name, ext=ext.strip('.'), to_lang=args.to_lang))
+
+    def outputs_for(path):
+        return [output_for(path, template) for template in templates]
+
+    def process(path, outputs):
+        # The outputs were just worked out from the templates above, thus each one lines up with its own --variant
+        variants = [[output, *options] for output, (_, *options) in zip(outputs[1:], args.variant or [])]
+        # The file extracted from a video on a previous try is still there, thus let ffmpeg overwrite it
+        translate_subs(argparse.Namespace(**{**vars(args), 'input': path, 'output': outputs[0], 'variant': variants}),
+                       translator, overwrite=True)
+
+    # Configuration mistakes would fail every single file, thus check it before anything gets queued
+    for template in templates:
+        try:
+            output_for('example.mkv', template)
+        except (KeyError, IndexError, ValueError) as e:
+            exit(f'Invalid output template "{template}": {e!r}. Use {{name}}, {{ext}} and {{to_lang}} only.')
+    get_variants(argparse.Namespace(**{**vars(args), 'output': args.output_template}))
+    get_language_manager(args.to_lang, args.ignore_line_ends, translator)
+
+    job_store = JobStore(args.job_store or os.path.join(directory, JOB_STORE_NAME))
+    watch_manager = WatchManager(directory=directory, job_store=job_store,
+                                 extensions=[ext.strip().strip('.') for ext in args.extensions.split(',')],
+                                 outputs_for=outputs_for, process=process, workers=args.workers,
+                                 poll_interval=args.poll_interval, retries=args.retries, retry_delay=args.retry_delay)
+    print(f'Watching "{directory}", translated subs go into "{output_dir}".')
+    try:
+        watch_manager.run(once=args.once)
+    except KeyboardInterrupt:
+        print('Stopped watching, unfinished files will be picked up on the next start.')
+        # Running translations cannot be interrupted and Python waits for their threads before exiting, which could
+        # take up to an hour while providers are blocked. Nothing is lost by not waiting: their jobs are still marked
+        # as running and get queued again on the next start, outputs are only ever replaced in one go and ffmpeg gets
+        # the same Ctrl-C from the terminal. Thus flush everything and exit straight away.
+        job_store.connection.close()
+        logging.shutdown()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(130)
+
+
+def worker(argv):
+    parser = argparse.ArgumentParser(
+        description='Translate chunks published to a shared queue by "translatesubs --queue". Run workers on several '
+                    'machines to spread the requests to Google across different IP addresses.',
+        usage='translatesubs worker /shared/chunks.db')
+    parser.add_argument('queue', type=str, help='Queue to take the chunks from e.g. SQLite file on shared storage.')
+    parser.add_argument('--queue_backend', default='sqlite', type=str,
+                        help=f'One of the queue backends to use: {QUEUES_PRINT}.')
+    parser.add_argument('--translators', default=','.join(AVAILABLE_TRANSLATORS), type=str,
+                        help='Comma separated list of Translate services this worker can use. Each chunk is translated '
+                             'using the service the coordinator was started with, chunks for other services are left '
+                             f'to other workers. Defaults to all of them: {TRANSLATORS_PRINT}.')
+    parser.add_argument('--poll_interval', default=1, type=float,
+                        help='Seconds to wait before checking the queue again when there is nothing to translate.')
+    parser.add_argument('--max_wait', default=240, type=float,
+                        help='Seconds to wait for blocked providers before failing the chunk. Keep it well below 10 '
+                             'minutes, after which the chunk is handed to another worker, bearing in mind that '
+                             'google_trans_new makes two requests per chunk.')
+    parser.add_argument('--logging', default=40, type=int,
+                        help='NOTSET - 0, DEBUG - 10, INFO - 20, WARNING - 30, ERROR - 40, CRITICAL - 50')
+    args = parser.parse_args(argv)
+
+    setup_logging(args.logging)
+    translators = {name.strip(): get_translator(name.strip(), max_wait=args.max_wait)
+                   for name in args.translators.split(',')}
+    worker_manager = WorkerManager(queue=get_queue(args.queue, args.queue_backend),
+                                   translators=translators, poll_interval=args.poll_interval)
+    print(f'Waiting for chunks to translate in "{args.queue}"...')
+    try:
+        worker_manager.run()
+    except KeyboardInterrupt:
+        print('Stopped the worker.')
+
+
+def add_translation_arguments(parser):
     parser.add_argument('--encoding', default='utf-8', type=str,
                         help='Input file encoding, which defaults to "utf-8". To determine it automatically use "auto"')
     parser.add_argument('--to_lang', default='es', type=str, help='Language to which translate to.')
@@ -45,6 +190,12 @@ def main():
     parser.add_argument('--line_char_limit', default=30, type=int,
                         help='Decide if keep multiple, often short, lines or merge them into one instead. Best '
                              'used with --merge flag since then extra lines are added. Recommended value 30 or 70.')
+    parser.add_argument('--variant', action='append', nargs='+', metavar=('OUTPUT', 'OPTION'),
+                        help='Also save another version of the subs from the same translation, thus no extra requests '
+                             'are made. Options override the flags above e.g. "--variant out.merged.ass merge reverse '
+                             'secondary_scale=60 line_char_limit=70". Supported options: merge, reverse, '
+                             'secondary_scale, secondary_alpha and line_char_limit. Use "merge=no" to turn off a flag. '
+                             'Can be given many times.')
     parser.add_argument('--input_type', default='auto', choices=['auto', 'video', 'subs'],
                         help='Specify input file type. By default it tries to automatically deduce the type.')
     parser.add_argument('--subs_track', default=0, type=int,
@@ -55,6 +206,14 @@ def main():
                              'gets corrupted, thus often many different separators have to be tried. On the other hand '
                              'google_trans_new seems to work very well, but removes new line chars in pronunciation...')
 
+    parser.add_argument('--queue', default=None, type=str,
+                        help='Instead of translating locally, publish the chunks to this queue e.g. SQLite file on '
+                             'shared storage, and let the workers started with "translatesubs worker" translate them.')
+    parser.add_argument('--queue_backend', default='sqlite', type=str,
+                        help=f'One of the queue backends to use with --queue: {QUEUES_PRINT}.')
+    parser.add_argument('--queue_timeout', default=0, type=float,
+                        help='Seconds to wait for the workers to translate the chunks published to --queue before '
+                             'giving up. Defaults to 0, which waits as long as it takes.')
     parser.add_argument('--logging', default=40, type=int,
                         help='NOTSET - 0, DEBUG - 10, INFO - 20, WARNING - 30, ERROR - 40, CRITICAL - 50')
     parser.add_argument('--ignore_line_ends', action='store_true',
@@ -78,32 +237,99 @@ def main():
                              'backslash for it.\n'
                              f'Default behavior tries separators one by one from the list: {DEFAULT_SEPS_PRINT}. '
                              'If these do not work, then only some good hack can help u :)')
-    args = parser.parse_args()
 
-    logging.basicConfig(stream=sys.stderr, level=args.logging)
+
+def setup_logging(level):
+    logging.basicConfig(stream=sys.stderr, level=level)
     logging.info(f'Using logging level {logging.getLogger()} - lvl {logging.getLogger().level}.')
 
+
+def translate_subs(args, translator, overwrite=False):
+    variants = get_variants(args)
+
     # Prepare original subs: extract text and styling
-    filename = get_subs_file(args)
+    filename = get_subs_file(args, overwrite)
     subs_manager = SubsManager(filename=filename, encoding=get_encoding(args.encoding, filename))
     subs_manager.extract_line_styling()
 
     # Perform translation: prepare extracted subs for translating and try different separators to see which will work
-    translator = get_translator(args.translator)
     language_manager = get_language_manager(args.to_lang, args.ignore_line_ends, translator)
     language_manager.prep_for_trans(subs_manager.just_text())
     original, translated = translate(language_manager, separators_to_try(args.separator),
                                      args.pronounce_original, args.pronounce_translated)
 
-    # To display firstly original and translated below instead
-    if args.reverse:
-        original, translated = translated, original
+    # Every variant is rendered from the same translation onto its own copy of the original subs
+    for variant in variants:
+        # To display firstly original and translated below instead
+        main_subs, secondary_subs = (original, translated) if variant.reverse else (translated, original)
+        rendered = subs_manager.render_subs(main_subs=main_subs, secondary_subs=secondary_subs,
+                                            merge=variant.merge, secondary_scale=variant.secondary_scale,
+                                            secondary_alpha=variant.secondary_alpha, char_limit=variant.line_char_limit)
+        # Save into a temporary file first, thus an interrupted run never leaves a half written output behind
+        directory, name = os.path.split(variant.output)
+        partial = os.path.join(directory, f'.partial.{name}')
+        rendered.save(partial)
+        os.replace(partial, variant.output)
+        logging.info(f'Saved translated subs into "{variant.output}".')
 
-    subs_manager.update_subs(main_subs=translated, secondary_subs=original,
-                             merge=args.merge, secondary_scale=args.secondary_scale,
-                             secondary_alpha=args.secondary_alpha, char_limit=args.line_char_limit)
-    subs_manager.save_subs(args.output)
-    print('Finished!')
+
+def plan_translation(args, translator):
+    filename = get_subs_file(args)
+    subs_manager = SubsManager(filename=filename, encoding=get_encoding(args.encoding, filename))
+    language_manager = get_language_manager(args.to_lang, args.ignore_line_ends, translator)
+    language_manager.prep_for_trans(subs_manager.just_text())
+
+    lines = list(subs_manager.just_text())
+    unique_lines = set(lines)
+    repeated_chars = sum(len(line) for line in lines) - sum(len(line) for line in unique_lines)
+    separators = separators_to_try(args.separator)
+    language_manager.set_separator(separators[0])
+    chunk_lengths = [len(chunk) for chunk in language_manager.combine_with_separator()]
+    requests = len(chunk_lengths) * translator.get_requests_per_chunk()
+
+    print(f'Events: {len(lines)}\n'
+          f'Unique lines: {len(unique_lines)}\n'
+          f'Repeated lines a cache could cover: {len(lines) - len(unique_lines)} '
+          f'({(len(lines) - len(unique_lines)) / max(len(lines), 1):.0%}), {repeated_chars} chars\n'
+          f'Chunks: {len(chunk_lengths)}\n'
+          f'Chars per chunk: min {min(chunk_lengths, default=0)}, '
+          f'avg {sum(chunk_lengths) / max(len(chunk_lengths), 1):.0f}, max {max(chunk_lengths, default=0)} '
+          f'(limit {translator.get_char_limit()})\n'
+          f'Chars in total: {sum(chunk_lengths)}\n'
+          f'Requests: {requests} using separator "{separators[0]}", up to {requests * len(separators)} if all '
+          f'{len(separators)} separators have to be tried')
+    for index, length in enumerate(chunk_lengths):
+        logging.info(f'Chunk {index}: {length} chars.')
+
+
+TRUE_VALUES = ('', '1', 'true', 'yes', 'on')
+FALSE_VALUES = ('0', 'false', 'no', 'off')
+
+
+def get_variants(args) -> List[argparse.Namespace]:
+    # The main output uses the usual flags, while every --variant starts from them and overrides some
+    defaults = {'merge': args.merge, 'reverse': args.reverse, 'secondary_scale': args.secondary_scale,
+                'secondary_alpha': args.secondary_alpha, 'line_char_limit': args.line_char_limit}
+    variants = [argparse.Namespace(output=args.output, **defaults)]
+
+    for output, *options in args.variant or []:
+        variant = dict(defaults)
+        for option in options:
+            name, _, value = option.partition('=')
+            if name not in defaults:
+                exit(f'Unknown option "{name}" for variant "{output}". Try one of: {", ".join(defaults)}.')
+            if isinstance(defaults[name], bool):
+                if value.lower() not in TRUE_VALUES + FALSE_VALUES:
+                    exit(f'Option "{name}" for variant "{output}" needs to be one of: '
+                         f'{", ".join(word for word in TRUE_VALUES + FALSE_VALUES if word)} or left without a value.')
+                variant[name] = value.lower() in TRUE_VALUES
+            elif value.isdigit():
+                variant[name] = int(value)
+            else:
+                exit(f'Option "{name}" for variant "{output}" needs a number e.g. {name}={defaults[name]}.')
+        variants.append(argparse.Namespace(output=output, **variant))
+
+    return variants
 
 
 def get_encoding(encoding, filename):
@@ -114,13 +340,14 @@ def get_encoding(encoding, filename):
         return res['encoding']
     return encoding
     
-def get_subs_file(args):
+def get_subs_file(args, overwrite=False):
     extension = os.path.splitext(args.input)[1].strip('.')
     if args.input_type == 'subs' or (args.input_type == 'auto' and extension in SUB_FORMATS):
         return args.input
 
     # must have selected video, simply extract the subtitle and return it's path
-    if not SubsManager.extract_from_video(video_in=args.input, subs_track=args.subs_track, subs_out=args.output):
+    if not SubsManager.extract_from_video(video_in=args.input, subs_track=args.subs_track, subs_out=args.output,
+                                          overwrite=overwrite):
         exit('Could not extract the subtitles!')
 
     print(f'Extracted subtitles from "{args.input}" into "{args.output}".')
@@ -140,14 +367,27 @@ def get_language_manager(to_lang, ignore_line_ends, translator):
     return language_manager
 
 
-def get_translator(translator_name):
+def get_translator(translator_name, queue_name=None, queue_backend='sqlite', queue_timeout=0, max_wait=3600):
     # Instantiate one of the translators
     translator = AVAILABLE_TRANSLATORS.get(translator_name, None)
     if not translator:
         exit(f'Translator "{translator_name}" is not supported. '
              f'Try one of the supported ones: {TRANSLATORS_PRINT}.')
 
-    return translator()
+    # When the queue is given, workers do the actual translation, while this one only uses it for languages and limits
+    if queue_name:
+        return QueueTranslator(get_queue(queue_name, queue_backend), translator(), translator_name,
+                               timeout=queue_timeout)
+    return translator(max_wait=max_wait)
+
+
+def get_queue(queue_name, queue_backend):
+    queue = AVAILABLE_QUEUES.get(queue_backend, None)
+    if not queue:
+        exit(f'Queue backend "{queue_backend}" is not supported. '
+             f'Try one of the supported ones: {QUEUES_PRINT}.')
+
+    return queue(queue_name)
 
 
 def translate(language_manager, separators, pronounce_origin, pronounce_trans):
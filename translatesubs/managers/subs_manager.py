@@ -1,3 +1,4 @@
+import copy
 import pysubs2
 import subprocess
 import logging
@@ -48,10 +49,13 @@ class SubsManager:
     def just_text(self) -> Iterator[str]:
         return (sub.plaintext for sub in self.subs)
 
-    def update_subs(self, main_subs: List[str], secondary_subs: List[str], merge: bool, secondary_scale: int, secondary_alpha: int, char_limit: int):
+    def render_subs(self, main_subs: List[str], secondary_subs: List[str], merge: bool, secondary_scale: int, secondary_alpha: int, char_limit: int) -> pysubs2.SSAFile:
+        """Writes the subs into a copy of the original subs and returns it, thus can be called many times to render
+        different variants of the same translation."""
+        rendered = copy.deepcopy(self.origin_subs)
         # original --> secondary
         # translated --> main
-        for main, secondary, sub, origin_sub in zip(main_subs, secondary_subs, self.subs, self.origin_subs):
+        for main, secondary, sub, origin_sub in zip(main_subs, secondary_subs, self.subs, rendered):
             # 1. For now ignore the in-line based styling e.g. bold single word.
             # 2. Replace \n with \N as otherwise the same sub will be treated as separate event aka next sub.
             # NOTE: When writing into plaintext, \n is replaced with \N. But we also want to add custom styling..            
@@ -66,13 +70,11 @@ class SubsManager:
                 secondary = ""
 
             origin_sub.text = f'{sub.open_style}{main}{secondary}{sub.close_style}'
-
-    def save_subs(self, subs_out: str):
-        self.origin_subs.save(subs_out)
+        return rendered
 
     @staticmethod
-    def extract_from_video(video_in: str, subs_track: int, subs_out: str) -> bool:
-        operation = ['ffmpeg', '-i', video_in, '-map', f'0:s:{subs_track}', subs_out]
+    def extract_from_video(video_in: str, subs_track: int, subs_out: str, overwrite: bool = False) -> bool:
+        operation = ['ffmpeg', *(['-y'] if overwrite else []), '-i', video_in, '-map', f'0:s:{subs_track}', subs_out]
         logging.debug(f'Extracting subs using {" ".join(operation)}')
         status = subprocess.run(operation)
         return status.returncode == 0
@@ -0,0 +1,177 @@
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+
+class JobStore:
+    """
+    Durable queue of files to translate. It is kept in a local SQLite file, thus pending and failed jobs survive
+    restarts of the watcher and every file is translated only once, unless it gets modified.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, filename: str):
+        self.connection = sqlite3.connect(filename)
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS jobs ('
+                                    'path TEXT PRIMARY KEY, '
+                                    'mtime REAL NOT NULL, '
+                                    'status TEXT NOT NULL, '
+                                    'attempts INTEGER NOT NULL DEFAULT 0, '
+                                    'next_attempt REAL NOT NULL DEFAULT 0, '
+                                    'requeue INTEGER NOT NULL DEFAULT 0, '
+                                    'error TEXT)')
+            # Every file written by a job, thus it is not picked up as a new input when saved into the watched folder
+            self.connection.execute('CREATE TABLE IF NOT EXISTS outputs (output TEXT PRIMARY KEY, path TEXT NOT NULL)')
+            # Jobs that were still running when the watcher stopped never finished, thus simply queue them again
+            self.connection.execute('UPDATE jobs SET status = ?, requeue = 0 WHERE status = ?',
+                                    (self.PENDING, self.RUNNING))
+
+    def enqueue(self, path: str, mtime: float) -> bool:
+        row = self.connection.execute('SELECT mtime, status FROM jobs WHERE path = ?', (path,)).fetchone()
+        if row and row[0] == mtime:
+            return False
+
+        if row and row[1] == self.RUNNING:
+            # Do not start a second translation of the same file, rather queue it again once the current one finishes
+            with self.connection:
+                self.connection.execute('UPDATE jobs SET mtime = ?, requeue = 1 WHERE path = ?', (mtime, path))
+            return True
+
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO jobs (path, mtime, status) VALUES (?, ?, ?)',
+                                    (path, mtime, self.PENDING))
+        return True
+
+    def claim(self, limit: int) -> List[str]:
+        paths = [path for path, in self.connection.execute('SELECT path FROM jobs WHERE status = ? AND next_attempt <= ? '
+                                                           'ORDER BY next_attempt LIMIT ?',
+                                                           (self.PENDING, time.time(), limit))]
+        with self.connection:
+            self.connection.executemany('UPDATE jobs SET status = ? WHERE path = ?',
+                                        [(self.RUNNING, path) for path in paths])
+        return paths
+
+    def add_outputs(self, path: str, outputs: List[str]):
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO outputs (output, path) VALUES (?, ?)',
+                                        [(output, path) for output in outputs])
+
+    def complete(self, path: str):
+        if self._requeue(path):
+            return
+        with self.connection:
+            self.connection.execute('UPDATE jobs SET status = ?, error = NULL WHERE path = ?', (self.DONE, path))
+
+    def fail(self, path: str, error: str, retries: int, retry_delay: float) -> bool:
+        """Marks the job as failed and schedules a retry with exponential backoff. Returns False when no retries are
+        left and the job is given up on."""
+        if self._requeue(path):
+            return True
+        attempts = self.connection.execute('SELECT attempts FROM jobs WHERE path = ?', (path,)).fetchone()[0] + 1
+        retry = attempts <= retries
+        with self.connection:
+            self.connection.execute('UPDATE jobs SET status = ?, attempts = ?, next_attempt = ?, error = ? '
+                                    'WHERE path = ?',
+                                    (self.PENDING if retry else self.FAILED, attempts,
+                                     time.time() + retry_delay * 2 ** (attempts - 1), error, path))
+        return retry
+
+    def _requeue(self, path: str) -> bool:
+        # The file changed while it was being translated, thus start over with the new version
+        with self.connection:
+            return self.connection.execute('UPDATE jobs SET status = ?, attempts = 0, next_attempt = 0, requeue = 0, '
+                                           'error = NULL WHERE path = ? AND requeue = 1',
+                                           (self.PENDING, path)).rowcount > 0
+
+    def is_output(self, path: str) -> bool:
+        return self.connection.execute('SELECT 1 FROM outputs WHERE output = ?', (path,)).fetchone() is not None
+
+    def has_unfinished(self) -> bool:
+        return self.connection.execute('SELECT 1 FROM jobs WHERE status IN (?, ?)',
+                                       (self.PENDING, self.RUNNING)).fetchone() is not None
+
+
+class WatchManager:
+    def __init__(self, directory: str, job_store: JobStore, extensions: List[str],
+                 outputs_for: Callable[[str], List[str]], process: Callable[[str, List[str]], None], workers: int,
+                 poll_interval: float, retries: int, retry_delay: float):
+        self.directory = directory
+        self.job_store = job_store
+        self.extensions = extensions
+        self.outputs_for = outputs_for
+        self.process = process
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.last_seen = {}
+
+    def run(self, once: bool = False):
+        running: Dict[Future, str] = {}
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            while True:
+                # When only translating what is already there, do not wait for the files to settle down
+                self._discover(require_settled=not once)
+
+                for future in [future for future in running if future.done()]:
+                    self._finish(running.pop(future), future)
+
+                for path in self.job_store.claim(self.workers - len(running)):
+                    # Outputs follow the templates the watcher runs with now, which might differ from the ones it ran
+                    # with when the file got queued. Record them before writing, so they are never taken as inputs.
+                    outputs = self.outputs_for(path)
+                    self.job_store.add_outputs(path, outputs)
+                    names = ', '.join(f'"{output}"' for output in outputs)
+                    print(f'Translating "{path}" into {names}...')
+                    running[pool.submit(self.process, path, outputs)] = path
+
+                if once and not running and not self.job_store.has_unfinished():
+                    break
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            # Do not wait for the running translations, they are still marked as running and get queued again on the
+            # next start
+            for future in running:
+                future.cancel()
+            pool.shutdown(wait=False)
+            raise
+        pool.shutdown()
+
+    def _discover(self, require_settled: bool):
+        seen = {}
+        for entry in os.scandir(self.directory):
+            extension = os.path.splitext(entry.name)[1].strip('.')
+            # Hidden files are skipped too, e.g. the job store or outputs still being written
+            if not entry.is_file() or entry.name.startswith('.') or extension not in self.extensions or \
+                    self.job_store.is_output(entry.path):
+                continue
+
+            stat = entry.stat()
+            seen[entry.path] = (stat.st_size, stat.st_mtime)
+            # The file might still be being copied, thus only pick it up once it did not change between two checks
+            if require_settled and self.last_seen.get(entry.path) != seen[entry.path]:
+                continue
+
+            if self.job_store.enqueue(entry.path, stat.st_mtime):
+                logging.info(f'Queued "{entry.path}".')
+        self.last_seen = seen
+
+    def _finish(self, path: str, future: Future):
+        # Translators raise TranslationError when they give up, while the other helpers call exit(), which surfaces
+        # here as SystemExit
+        error = future.exception()
+        if not error:
+            self.job_store.complete(path)
+            print(f'Finished "{path}".')
+        elif self.job_store.fail(path, str(error), self.retries, self.retry_delay):
+            print(f'Failed to translate "{path}": {error}\nWill retry later.')
+        else:
+            print(f'Failed to translate "{path}": {error}\nGiving up after {self.retries} retries.')
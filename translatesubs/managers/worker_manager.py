@@ -0,0 +1,38 @@
+import logging
+import time
+from typing import Dict
+
+from translatesubs.queues.iqueue import IQueue
+from translatesubs.translators.itranslator import ITranslator
+
+
+class WorkerManager:
+    def __init__(self, queue: IQueue, translators: Dict[str, ITranslator], poll_interval: float):
+        # Chunks are only taken if they have to be translated by one of these translators
+        self.queue = queue
+        self.translators = translators
+        self.poll_interval = poll_interval
+
+    def run(self):
+        while True:
+            chunk = self.queue.claim(list(self.translators))
+            if not chunk:
+                time.sleep(self.poll_interval)
+                continue
+
+            chunk_id, token, translator, to_lang, text = chunk
+            logging.info(f'Translating chunk {chunk_id} with {len(text)} chars into "{to_lang}" using {translator}.')
+            try:
+                translated = next(iter(self.translators[translator].translate([text], to_lang)))
+            except Exception as e:
+                # Let another worker, possibly with a different IP address, take it instead
+                logging.warning(f'Failed to translate chunk {chunk_id}: {e}')
+                self.queue.fail(chunk_id, token, str(e))
+                time.sleep(self.poll_interval)
+                continue
+            except BaseException:
+                self.queue.release(chunk_id, token)
+                raise
+
+            self.queue.complete(chunk_id, token, translated)
+            print(f'Translated chunk {chunk_id}.')
@@ -0,0 +1,49 @@
+from typing import List, Dict, Optional, Tuple
+from translatesubs.translators.translated import Translated
+from abc import ABC, abstractmethod
+
+
+class IQueue(ABC):
+    """
+    Work queue shared between the coordinator, which publishes chunks to be translated, and the workers, which
+    translate them and push back the results.
+    """
+
+    @abstractmethod
+    def publish(self, batch: str, translator: str, to_lang: str, chunks: List[str]):
+        pass
+
+    @abstractmethod
+    def claim(self, translators: List[str]) -> Optional[Tuple[int, str, str, str, str]]:
+        """Takes the next chunk, which has to be translated by one of the given translators, and returns its id,
+        claim token, translator name, target language and text or None if there is none. The token has to be passed
+        back when reporting on the chunk, thus a worker, whose claim expired, cannot touch the chunk anymore."""
+        pass
+
+    @abstractmethod
+    def complete(self, chunk_id: int, token: str, translated: Translated):
+        pass
+
+    @abstractmethod
+    def release(self, chunk_id: int, token: str):
+        """Gives the chunk back to the queue, so that another worker could translate it."""
+        pass
+
+    @abstractmethod
+    def fail(self, chunk_id: int, token: str, error: str):
+        """Same as release, but counts as a failed try. Once the chunk runs out of tries, it is marked as failed."""
+        pass
+
+    @abstractmethod
+    def results(self, batch: str) -> Dict[int, Translated]:
+        """Returns already translated chunks of the batch, keyed by their position in the batch."""
+        pass
+
+    @abstractmethod
+    def errors(self, batch: str) -> List[str]:
+        """Returns errors of the chunks in the batch, which ran out of tries."""
+        pass
+
+    @abstractmethod
+    def discard(self, batch: str):
+        pass
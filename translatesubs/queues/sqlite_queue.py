@@ -0,0 +1,124 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
+
+from translatesubs.queues.iqueue import IQueue
+from translatesubs.translators.translated import Translated
+
+
+class SqliteQueue(IQueue):
+    """
+    Queue kept in a single SQLite file. Put it on storage shared by all of the machines to spread the work across
+    them, or use it locally to run several workers on the same machine. Note that SQLite relies on file locking, which
+    some network file systems do not implement properly.
+    """
+    PENDING = 'pending'
+    CLAIMED = 'claimed'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, filename: str, claim_timeout: float = 600, max_attempts: int = 5):
+        # Chunks claimed by a worker, which did not report back within claim_timeout seconds, are handed out again,
+        # which counts as a failed try just like the ones the workers report
+        self.claim_timeout = claim_timeout
+        self.max_attempts = max_attempts
+        # The connection is shared by all threads of this process e.g. when translating several files at once
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, timeout=60, isolation_level=None, check_same_thread=False)
+        with self._transaction():
+            self.connection.execute('CREATE TABLE IF NOT EXISTS chunks ('
+                                    'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                                    'batch TEXT NOT NULL, '
+                                    'position INTEGER NOT NULL, '
+                                    'translator TEXT NOT NULL, '
+                                    'to_lang TEXT NOT NULL, '
+                                    'text TEXT NOT NULL, '
+                                    'status TEXT NOT NULL, '
+                                    'claimed_at REAL, '
+                                    'claim_token TEXT, '
+                                    'attempts INTEGER NOT NULL DEFAULT 0, '
+                                    'error TEXT, '
+                                    'result TEXT)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS chunks_status ON chunks (status, id)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS chunks_batch ON chunks (batch, position)')
+
+    def publish(self, batch: str, translator: str, to_lang: str, chunks: List[str]):
+        with self._transaction():
+            self.connection.executemany('INSERT INTO chunks (batch, position, translator, to_lang, text, status) '
+                                        'VALUES (?, ?, ?, ?, ?, ?)',
+                                        [(batch, position, translator, to_lang, text, self.PENDING)
+                                         for position, text in enumerate(chunks)])
+
+    def claim(self, translators: List[str]) -> Optional[Tuple[int, str, str, str, str]]:
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._transaction():
+            # The worker, which claimed these, most likely died, thus give them out again or give up on them
+            self.connection.execute('UPDATE chunks SET attempts = attempts + 1, claimed_at = NULL, claim_token = NULL, '
+                                    'error = ?, status = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END '
+                                    'WHERE status = ? AND claimed_at < ?',
+                                    (f'Worker did not report back within {self.claim_timeout:.0f}s.',
+                                     self.max_attempts, self.FAILED, self.PENDING, self.CLAIMED,
+                                     now - self.claim_timeout))
+            chunk = self.connection.execute('SELECT id, translator, to_lang, text FROM chunks WHERE status = ? '
+                                            f'AND translator IN ({", ".join("?" * len(translators))}) '
+                                            'ORDER BY id LIMIT 1', (self.PENDING, *translators)).fetchone()
+            if not chunk:
+                return None
+            self.connection.execute('UPDATE chunks SET status = ?, claimed_at = ?, claim_token = ? WHERE id = ?',
+                                    (self.CLAIMED, now, token, chunk[0]))
+        chunk_id, translator, to_lang, text = chunk
+        return chunk_id, token, translator, to_lang, text
+
+    def complete(self, chunk_id: int, token: str, translated: Translated):
+        with self._transaction():
+            self.connection.execute('UPDATE chunks SET status = ?, result = ?, claim_token = NULL '
+                                    'WHERE id = ? AND status = ? AND claim_token = ?',
+                                    (self.DONE, json.dumps(vars(translated)), chunk_id, self.CLAIMED, token))
+
+    def release(self, chunk_id: int, token: str):
+        with self._transaction():
+            self.connection.execute('UPDATE chunks SET status = ?, claimed_at = NULL, claim_token = NULL '
+                                    'WHERE id = ? AND status = ? AND claim_token = ?',
+                                    (self.PENDING, chunk_id, self.CLAIMED, token))
+
+    def fail(self, chunk_id: int, token: str, error: str):
+        with self._transaction():
+            self.connection.execute('UPDATE chunks SET attempts = attempts + 1, error = ?, claimed_at = NULL, '
+                                    'claim_token = NULL, status = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END '
+                                    'WHERE id = ? AND status = ? AND claim_token = ?',
+                                    (error, self.max_attempts, self.FAILED, self.PENDING, chunk_id, self.CLAIMED,
+                                     token))
+
+    def results(self, batch: str) -> Dict[int, Translated]:
+        rows = self._read('SELECT position, result FROM chunks WHERE batch = ? AND status = ?', (batch, self.DONE))
+        return {position: Translated(**json.loads(result)) for position, result in rows}
+
+    def errors(self, batch: str) -> List[str]:
+        rows = self._read('SELECT position, error FROM chunks WHERE batch = ? AND status = ?', (batch, self.FAILED))
+        return [f'chunk {position}: {error}' for position, error in rows]
+
+    def discard(self, batch: str):
+        with self._transaction():
+            self.connection.execute('DELETE FROM chunks WHERE batch = ?', (batch,))
+
+    def _read(self, query: str, parameters: tuple) -> List[tuple]:
+        # Plain reads do not need the write lock, which would keep the workers waiting every time the coordinator polls
+        with self.lock:
+            return self.connection.execute(query, parameters).fetchall()
+
+    @contextmanager
+    def _transaction(self):
+        # Take the write lock straight away, so that two workers could never claim the same chunk
+        with self.lock:
+            self.connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield
+            except BaseException:
+                self.connection.execute('ROLLBACK')
+                raise
+            self.connection.execute('COMMIT')
@@ -1,10 +1,10 @@
 import google_trans_new
 from typing import List, Iterator
-import logging
 import re
 
 from translatesubs.translators.itranslator import ITranslator
 from translatesubs.translators.language import Language
+from translatesubs.translators.provider_pool import ProviderPool
 from translatesubs.translators.translated import Translated
 
 
@@ -14,9 +14,22 @@ class GoogleTransNew(ITranslator):
     thus if it is important to preserve perfect styling, you are better off using another translation service.
     """
 
+    def __init__(self, max_wait: float = 3600):
+        # Google API provider should allow new access every 1h, but if more translations need to be done,
+        # a number of different country providers are given
+        # E.g. from here https://sites.google.com/site/tech4teachlearn/googleapps/google-country-codes
+        # But have to make sure the site actually loads first :)
+        ending_formula = re.compile(r'translate\..*?\.(.+)$')  # for for com, co.uk, lt or others
+        self.provider_pool = ProviderPool([ending_formula.search(url).group(1)
+                                           for url in google_trans_new.DEFAULT_SERVICE_URLS], max_wait=max_wait)
+
     def get_char_limit(self) -> int:
         return 5000
 
+    def get_requests_per_chunk(self) -> int:
+        # Pronunciation is requested separately from the translation
+        return 2
+
     def translate(self, text: List[str], to_lang: str) -> Iterator[Translated]:
         for original in text:
             pronounced = self._do_translate(original, to_lang, pronounce=True)
@@ -33,8 +46,7 @@ class GoogleTransNew(ITranslator):
     def get_supported(self) -> str:
         return ', '.join([f'{abb} - {full}' for abb, full in google_trans_new.LANGUAGES.items()])
 
-    @staticmethod
-    def _do_translate(text: str, to_lang: str, pronounce=False):
+    def _do_translate(self, text: str, to_lang: str, pronounce=False):
         """
         Call google translate API to translate given text
 
@@ -44,20 +56,9 @@ class GoogleTransNew(ITranslator):
 
         :return: translated text in the same form it was provided
         """
-        # Google API provider should allow new access every 1h, but if more translations need to be done,
-        # a number of different country providers are given
-        # E.g. from here https://sites.google.com/site/tech4teachlearn/googleapps/google-country-codes
-        # But have to make sure the site actually loads first :)
-        ending_formula = re.compile(r'translate\..*?\.(.+)$')  # for for com, co.uk, lt or others
-        provider_endings = (ending_formula.search(url).group(1) for url in google_trans_new.DEFAULT_SERVICE_URLS)
-
-        for ending in provider_endings:
-            translator = google_trans_new.google_translator(url_suffix=ending)
-            try:
-                return translator.translate(text, lang_tgt=to_lang, pronounce=pronounce)
-            except AttributeError:
-                logging.info(f'Provider "translate.google.{ending}" got blocked, trying another one...')
-        exit('No more providers left to try, try updating the provider list or wait 1h until you get unblocked.')
+        return self.provider_pool.call(
+            lambda ending: google_trans_new.google_translator(url_suffix=ending).translate(text, lang_tgt=to_lang,
+                                                                                           pronounce=pronounce))
 
     @staticmethod
     def _pronounce_origin(translated: List[str], default: str) -> str:
@@ -1,9 +1,9 @@
 import googletrans
 from typing import List, Iterator
-import logging
 import re
 from translatesubs.translators.itranslator import ITranslator
 from translatesubs.translators.language import Language
+from translatesubs.translators.provider_pool import ProviderPool
 from translatesubs.translators.translated import Translated
 from translatesubs.utils.tools import nth
 
@@ -40,11 +40,22 @@ Logic:
 
 
 class GoogleTrans(ITranslator):
+    def __init__(self, max_wait: float = 3600):
+        # Google API provider should allow new access every 1h, but if more translations need to be done,
+        # a number of different country providers are given
+        # E.g. from here https://sites.google.com/site/tech4teachlearn/googleapps/google-country-codes
+        # But have to make sure the site actually loads first :)
+        ending_formula = re.compile(r'translate\..*?\.(.+)$')  # for for com, co.uk, lt or others
+        provider_endings = (ending_formula.search(url).group(1) for url in googletrans.constants.DEFAULT_SERVICE_URLS)
+        provider_base = 'translate.googleapis'
+        self.provider_pool = ProviderPool([f'{provider_base}.{ending}' for ending in provider_endings],
+                                          max_wait=max_wait)
+
     def get_char_limit(self) -> int:
         return 5000
 
     def translate(self, text: List[str], to_lang: str) -> Iterator[Translated]:
-        google_translated = GoogleTrans._do_translate(text, to_lang)
+        google_translated = self._do_translate(text, to_lang)
         for original, translated in zip(text, google_translated):
             yield Translated(original=original,
                              translated=translated.text.strip(),
@@ -58,8 +69,7 @@ class GoogleTrans(ITranslator):
     def get_supported(self) -> str:
         return ', '.join([f'{abb} - {full}' for abb, full in googletrans.LANGUAGES.items()])
 
-    @staticmethod
-    def _do_translate(text: List[str], to_lang: str) -> List[googletrans.models.Translated]:
+    def _do_translate(self, text: List[str], to_lang: str) -> List[googletrans.models.Translated]:
         """
         Call google translate API to translate given text
 
@@ -69,23 +79,8 @@ class GoogleTrans(ITranslator):
 
         :return: translated text in the same form it was provided
         """
-        # Google API provider should allow new access every 1h, but if more translations need to be done,
-        # a number of different country providers are given
-        # E.g. from here https://sites.google.com/site/tech4teachlearn/googleapps/google-country-codes
-        # But have to make sure the site actually loads first :)
-
-        ending_formula = re.compile(r'translate\..*?\.(.+)$')  # for for com, co.uk, lt or others
-        provider_endings = (ending_formula.search(url).group(1) for url in googletrans.constants.DEFAULT_SERVICE_URLS)
-        provider_base = 'translate.googleapis'
-
-        for ending in provider_endings:
-            provider = f'{provider_base}.{ending}'
-            translator = googletrans.Translator(service_urls=[provider])
-            try:
-                return translator.translate(text, dest=to_lang)
-            except AttributeError:
-                logging.info(f'Provider "{provider}" got blocked, trying another one...')
-        exit('No more providers left to try, try updating the provider list or wait 1h until you get unblocked.')
+        return self.provider_pool.call(
+            lambda provider: googletrans.Translator(service_urls=[provider]).translate(text, dest=to_lang))
 
     @staticmethod
     def _pronounce_origin(translated: googletrans.models.Translated) -> str:
@@ -4,6 +4,11 @@ from translatesubs.translators.language import Language
 from abc import ABC, abstractmethod
 
 
+class TranslationError(Exception):
+    """Raised when the translator gives up, so that the caller could decide whether to retry later."""
+    pass
+
+
 class ITranslator(ABC):
     @abstractmethod
     def translate(self, text: List[str], to_lang: str) -> Iterator[Translated]:
@@ -20,3 +25,7 @@ class ITranslator(ABC):
     @abstractmethod
     def get_char_limit(self) -> int:
         pass
+
+    def get_requests_per_chunk(self) -> int:
+        """Number of requests sent to translate a single chunk, including the ones to get pronunciations."""
+        return 1
@@ -0,0 +1,92 @@
+import logging
+import random
+import threading
+import time
+from typing import Callable, List, Optional, TypeVar
+
+from translatesubs.translators.itranslator import TranslationError
+
+T = TypeVar('T')
+
+
+class ProviderHealth:
+    def __init__(self):
+        self.latency = None
+        self.failures = 0
+        self.blocked_until = 0.0
+
+
+class ProviderPool:
+    """
+    Keeps track of how every Google provider (e.g. translate.google.com, translate.google.co.uk) performs. Once
+    a provider gets blocked, it is not tried again until its cool-down passes, which doubles every time the provider
+    gets blocked again. Out of the healthy providers the fastest one is used, while the ones never tried before are
+    used in the given order. If all of them are blocked, waits for the first one to come back, but gives up with
+    TranslationError after waiting max_wait seconds in total.
+    """
+    LATENCY_SMOOTHING = 0.3
+
+    def __init__(self, providers: List[str], cooldown: float = 60, max_cooldown: float = 3600,
+                 max_wait: float = 3600):
+        self.providers = {provider: ProviderHealth() for provider in providers}
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_wait = max_wait
+        # The same translator, thus the same pool, might be shared by many threads e.g. when watching a folder
+        self.lock = threading.Lock()
+
+    def call(self, request: Callable[[str], T]) -> T:
+        """Calls request with the best provider available. Google does not tell that it blocked the provider, but
+        the translation libraries then fail with AttributeError, thus that is treated as provider being blocked.
+        Note that the libraries fail the same way when they cannot parse the response, thus do not wait forever."""
+        waited = 0.0
+        while True:
+            provider = self._next_provider()
+            if not provider:
+                wait = self._wait_time()
+                if waited + wait > self.max_wait:
+                    raise TranslationError(f'All providers are still blocked after waiting {waited:.0f}s, try '
+                                           'updating the provider list or try again later.')
+                logging.warning(f'All providers are blocked, waiting {wait:.0f}s for one of them to get unblocked...')
+                time.sleep(wait)
+                waited += wait
+                continue
+
+            start = time.monotonic()
+            try:
+                result = request(provider)
+            except AttributeError:
+                self._blocked(provider)
+                continue
+            self._succeeded(provider, time.monotonic() - start)
+            return result
+
+    def _next_provider(self) -> Optional[str]:
+        now = time.time()
+        with self.lock:
+            healthy = [(health.latency is None, health.latency or 0, index, provider)
+                       for index, (provider, health) in enumerate(self.providers.items())
+                       if health.blocked_until <= now]
+        return min(healthy)[-1] if healthy else None
+
+    def _wait_time(self) -> float:
+        with self.lock:
+            unblocked_at = min(health.blocked_until for health in self.providers.values())
+        # Add some jitter, so that everyone waiting for the same provider would not retry at the exact same moment
+        return max(unblocked_at - time.time(), 1) * random.uniform(1, 1.2)
+
+    def _blocked(self, provider: str):
+        with self.lock:
+            health = self.providers[provider]
+            health.failures += 1
+            cooldown = min(self.cooldown * 2 ** (health.failures - 1), self.max_cooldown)
+            health.blocked_until = time.time() + cooldown
+        logging.info(f'Provider "{provider}" got blocked, not using it for {cooldown:.0f}s.')
+
+    def _succeeded(self, provider: str, latency: float):
+        with self.lock:
+            health = self.providers[provider]
+            health.failures = 0
+            health.latency = latency if health.latency is None else \
+                self.LATENCY_SMOOTHING * latency + (1 - self.LATENCY_SMOOTHING) * health.latency
+        logging.debug(f'Provider "{provider}" responded in {latency:.2f}s.')
@@ -0,0 +1,65 @@
+import logging
+import time
+import uuid
+from typing import List, Iterator
+
+from translatesubs.queues.iqueue import IQueue
+from translatesubs.translators.itranslator import ITranslator, TranslationError
+from translatesubs.translators.language import Language
+from translatesubs.translators.translated import Translated
+
+
+class QueueTranslator(ITranslator):
+    """
+    Rather than translating the chunks itself, publishes them to a shared queue and waits for the workers (see
+    "translatesubs worker") to translate them. Each worker can run on a different machine, thus requests to Google are
+    spread across many IP addresses. Workers translate the chunks using the same translator as given here, which is
+    also used for languages and char limits.
+    """
+
+    def __init__(self, queue: IQueue, translator: ITranslator, translator_name: str, poll_interval: float = 1,
+                 timeout: float = 0):
+        self.queue = queue
+        self.translator = translator
+        self.translator_name = translator_name
+        self.poll_interval = poll_interval
+        # Seconds to wait for the workers to translate all of the chunks, 0 means waiting as long as it takes
+        self.timeout = timeout
+
+    def get_char_limit(self) -> int:
+        return self.translator.get_char_limit()
+
+    def get_requests_per_chunk(self) -> int:
+        return self.translator.get_requests_per_chunk()
+
+    def translate(self, text: List[str], to_lang: str) -> Iterator[Translated]:
+        batch = uuid.uuid4().hex
+        self.queue.publish(batch, self.translator_name, to_lang, text)
+        print(f'Published {len(text)} chunks, waiting for the workers to translate them...')
+        started = time.monotonic()
+        try:
+            results = self.queue.results(batch)
+            while len(results) < len(text):
+                errors = self.queue.errors(batch)
+                if errors:
+                    raise TranslationError(f'Workers failed to translate {len(errors)} chunks:\n' + '\n'.join(errors))
+                if self.timeout and time.monotonic() - started > self.timeout:
+                    raise TranslationError(f'Workers translated only {len(results)}/{len(text)} chunks within '
+                                           f'{self.timeout:.0f}s, make sure they are running.')
+
+                time.sleep(self.poll_interval)
+                translated = len(results)
+                results = self.queue.results(batch)
+                if len(results) != translated:
+                    logging.info(f'Translated {len(results)}/{len(text)} chunks of batch {batch}.')
+        finally:
+            self.queue.discard(batch)
+
+        # Workers finish in any order, thus put the chunks back in the order they were published
+        return (results[position] for position in range(len(text)))
+
+    def detect_language(self, to_lang: str) -> Language:
+        return self.translator.detect_language(to_lang)
+
+    def get_supported(self) -> str:
+        return self.translator.get_supported()
@@ -1,11 +1,15 @@
 from translatesubs.translators.googletrans import GoogleTrans
 from translatesubs.translators.google_trans_new import GoogleTransNew
+from translatesubs.queues.sqlite_queue import SqliteQueue
 
 
 AVAILABLE_TRANSLATORS = {'googletrans': GoogleTrans,            # Does not keep newlines for pronunciation only
                          'google_trans_new': GoogleTransNew}    # Does not keep newlines
 TRANSLATORS_PRINT = ', '.join(AVAILABLE_TRANSLATORS.keys())
 
+AVAILABLE_QUEUES = {'sqlite': SqliteQueue}    # Single file, either local or on storage shared between machines
+QUEUES_PRINT = ', '.join(AVAILABLE_QUEUES.keys())
+
 ENDS_OF_SENTENCES = {
     'Usual': '.!?"\')',
     'Japanese': 'よねのさぞなか！。」…',
@@ -18,3 +22,6 @@ DEFAULT_SEPS_PRINT = ', '.join((f'\"{sep}\"' for sep in DEFAULT_SEPS))
 SEP_MAX_LENGTH = 7
 
 SUB_FORMATS = ('srt', 'ass', 'ssa', 'mpl2', 'tmp', 'vtt', 'microdvd')
+VIDEO_FORMATS = ('mkv', 'mp4', 'avi', 'webm', 'mov')
+
+JOB_STORE_NAME = '.translatesubs_jobs.db'